@@ -1,129 +1,278 @@
 import asyncio
+import contextlib
+import heapq
 import logging
+from operator import itemgetter
+
+import httpx
 from telegram import Bot, Update
 from telegram.ext import Application, CommandHandler, ContextTypes, ApplicationBuilder
 from telegram.constants import ParseMode
+from telegram._utils.defaultvalue import DefaultValue
+from telegram.error import NetworkError, RetryAfter, TimedOut
+from telegram.request import BaseRequest, HTTPXRequest
 
 # Assuming p2p_fetcher.py exists and get_top_sellers_under_threshold is defined within it
-from p2p_fetcher import get_top_sellers_under_threshold
+from p2p_fetcher import JSON_BACKEND, create_session, fetch_all_ads, get_top_sellers_under_threshold, json_dumps_bytes, parse_ads
 
 # ==================== CONFIG ====================
 
 DEFAULT_THRESHOLD = 91
+ADVERTISER_URL_PREFIX = "https://p2p.binance.com/en/advertiserDetail?advertiserNo="
+ADVERTISER_FALLBACK_URL = "https://p2p.binance.com/en"
+POLL_INTERVAL = 60  # seconds between Binance fetches / threshold checks
+SUMMARY_INTERVAL = 300  # seconds between periodic summaries
+SEND_INTERVAL = 1 / 25  # seconds between outbound messages, under Telegram's 30 msg/s limit
+SEND_TIMEOUT = 10  # seconds before a single send_message call is abandoned
+MAX_SEND_ATTEMPTS = 3  # tries per queued message when Telegram answers 429 RetryAfter
+DRAIN_TIMEOUT = 15  # seconds allowed on stop for queued messages to go out
 # ================================================
 
+# Message row templates, parsed once at import and filled per ad with str.format_map
+_ROW_TMPL = (
+    "{idx}. <b>{price} INR</b> | {available} USDT | {nickname}\n"
+    "Min: {min} | Max: {max}\n"
+    "<a href=\"{link}\">🔗 View & Buy</a>\n\n"
+)
+_TOP_PRICE_ROW_TMPL = (
+    "{idx}. <b>{price} INR</b> | {available} USDT | {nickname}\n"
+    "<a href=\"{link}\">🔗 View Profile</a>\n\n"
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
+def _split_ad(ad):
+    """Returns the (adv, advertiser) sub-dicts, only building empty fallbacks when a key is missing."""
+    try:
+        return ad["adv"], ad["advertiser"]
+    except KeyError:
+        return ad.get("adv", {}), ad.get("advertiser", {})
+
+class JSONBodyHTTPXRequest(HTTPXRequest):
+    """
+    HTTPXRequest that posts Bot API calls as a single JSON body, encoded with the same
+    backend p2p_fetcher picked (orjson when installed), instead of form fields JSON-encoded
+    one by one with the stdlib. Uploads (multipart) fall back to the stock behaviour.
+
+    The body below mirrors HTTPXRequest.do_request from python-telegram-bot 21.6
+    (closed-client guard, default timeouts, error mapping); re-check it when upgrading PTB.
+    """
+
+    async def do_request(
+        self,
+        url,
+        method,
+        request_data=None,
+        read_timeout=BaseRequest.DEFAULT_NONE,
+        write_timeout=BaseRequest.DEFAULT_NONE,
+        connect_timeout=BaseRequest.DEFAULT_NONE,
+        pool_timeout=BaseRequest.DEFAULT_NONE,
+    ):
+        if request_data is None or request_data.contains_files:
+            return await super().do_request(
+                url,
+                method,
+                request_data,
+                read_timeout=read_timeout,
+                write_timeout=write_timeout,
+                connect_timeout=connect_timeout,
+                pool_timeout=pool_timeout,
+            )
+
+        if self._client.is_closed:
+            raise RuntimeError("This HTTPXRequest is not initialized!")
+
+        # Timeouts the caller didn't override fall back to the ones this instance was built with
+        if isinstance(read_timeout, DefaultValue):
+            read_timeout = self._client.timeout.read
+        if isinstance(connect_timeout, DefaultValue):
+            connect_timeout = self._client.timeout.connect
+        if isinstance(pool_timeout, DefaultValue):
+            pool_timeout = self._client.timeout.pool
+        if isinstance(write_timeout, DefaultValue):
+            write_timeout = self._client.timeout.write
+
+        timeout = httpx.Timeout(
+            connect=connect_timeout, read=read_timeout, write=write_timeout, pool=pool_timeout
+        )
+
+        try:
+            res = await self._client.request(
+                method=method,
+                url=url,
+                headers={"User-Agent": self.USER_AGENT, "Content-Type": "application/json"},
+                content=json_dumps_bytes(request_data.parameters),
+                timeout=timeout,
+            )
+        except httpx.TimeoutException as err:
+            if isinstance(err, httpx.PoolTimeout):
+                raise TimedOut(
+                    message=(
+                        "Pool timeout: All connections in the connection pool are occupied. "
+                        "Request was *not* sent to Telegram. Consider adjusting the connection "
+                        "pool size or the pool timeout."
+                    )
+                ) from err
+            raise TimedOut from err
+        except httpx.HTTPError as err:
+            raise NetworkError(f"httpx.{err.__class__.__name__}: {err}") from err
+        return res.status_code, res.content
+
 # No global 'bot' instance needed if we're always using ContextTypes.DEFAULT_TYPE.bot
 # or application.bot directly after the application is built.
 
-async def format_and_send_sellers(bot_instance: Bot, sellers, threshold, chat_id):
+# Outbound (message kwargs, dedupe) pairs, sent one at a time by sender_worker
+OUT_QUEUE = asyncio.Queue()
+# chat_id -> text of the last deduplicated message actually delivered to that chat
+LAST_SENT = {}
+
+async def send_message(bot_instance: Bot, **kwargs):
+    """Sends a message directly, giving up after SEND_TIMEOUT so a hung request can't pile up."""
+    async with asyncio.timeout(SEND_TIMEOUT):
+        return await bot_instance.send_message(**kwargs)
+
+def enqueue_message(chat_id, text, *, dedupe=False, **kwargs):
+    """
+    Queues a message for sender_worker.
+    With dedupe=True the message is dropped if it repeats the last deduplicated one delivered to the chat.
+    """
+    if dedupe and LAST_SENT.get(chat_id) == text:
+        logging.info(f"Skipping duplicate message for chat {chat_id}.")
+        return
+    OUT_QUEUE.put_nowait(({"chat_id": chat_id, "text": text, **kwargs}, dedupe))
+
+async def sender_worker(bot_instance: Bot):
+    """Sends queued messages one by one, pacing them to stay within Telegram's rate limits."""
+    while True:
+        msg, dedupe = await OUT_QUEUE.get()
+        try:
+            await _deliver(bot_instance, msg, dedupe)
+        finally:
+            OUT_QUEUE.task_done()
+        await asyncio.sleep(SEND_INTERVAL)
+
+async def _deliver(bot_instance: Bot, msg, dedupe):
+    """Sends one queued message, waiting out Telegram's RetryAfter before trying again."""
+    chat_id = msg["chat_id"]
+    for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+        try:
+            await send_message(bot_instance, **msg)
+        except RetryAfter as e:
+            if attempt == MAX_SEND_ATTEMPTS:
+                logging.error(f"Giving up on message to chat {chat_id} after {attempt} rate-limited attempts.")
+                return
+            logging.warning(f"Rate limited sending to chat {chat_id}; retrying in {e.retry_after}s.")
+            await asyncio.sleep(e.retry_after)
+        except TimeoutError:
+            logging.error(f"Timed out after {SEND_TIMEOUT}s sending message to chat {chat_id}.")
+            return
+        except Exception as e:
+            logging.error(f"Error sending message to chat {chat_id}: {e}")
+            return
+        else:
+            # Only a delivered alert counts as the one to suppress repeats of
+            if dedupe:
+                LAST_SENT[chat_id] = msg["text"]
+            logging.info(f"Message sent to chat {chat_id} successfully.")
+            return
+
+def format_and_send_sellers(sellers, threshold, chat_id, *, dedupe=False):
     """
-    Formats seller data and sends it to the specified chat.
-    Takes a bot_instance to allow calling it from different contexts (e.g., periodic tasks, commands).
+    Formats seller data and queues it for the specified chat.
+    Pass dedupe=True to skip the message when it repeats the previous alert.
     """
     logging.info(f"Preparing message for {len(sellers)} sellers under {threshold} for chat {chat_id}")
     if not sellers:
         message = f"⚠️ No sellers found under {threshold} INR currently."
     else:
-        message = f"<b>Top {len(sellers)} Sellers under {threshold} INR:</b>\n\n"
+        parts = [f"<b>Top {len(sellers)} Sellers under {threshold} INR:</b>\n\n"]
         for idx, ad in enumerate(sellers, 1):
-            adv = ad.get("adv", {})
-            price = adv.get("price", "N/A")
-            available = adv.get("surplusAmount", "N/A")
-            min_single_trans = adv.get("minSingleTransAmount", "N/A")
-            max_single_trans = adv.get("maxSingleTransAmount", "N/A")
-
-            advertiser = ad.get("advertiser", {})
-            nickname = advertiser.get("nickName", "N/A")
+            adv, advertiser = _split_ad(ad)
             user_no = advertiser.get("userNo")
-            link = f"https://p2p.binance.com/en/advertiserDetail?advertiserNo={user_no}" if user_no else "https://p2p.binance.com/en"
 
-            message += (
-                f"{idx}. <b>{price} INR</b> | {available} USDT | {nickname}\n"
-                f"Min: {min_single_trans} | Max: {max_single_trans}\n"
-                f"<a href=\"{link}\">🔗 View & Buy</a>\n\n"
-            )
-
-    try:
-        await bot_instance.send_message( # Use the passed bot_instance
-            chat_id=chat_id,
-            text=message,
-            parse_mode=ParseMode.HTML,
-            disable_web_page_preview=True
-        )
-        logging.info(f"Message sent to chat {chat_id} successfully.")
-    except Exception as e:
-        logging.error(f"Error sending message to chat {chat_id}: {e}")
-
-
-async def format_and_send_top_prices(bot_instance: Bot, sellers, chat_id, count=10):
+            parts.append(_ROW_TMPL.format_map({
+                "idx": idx,
+                "price": adv.get("price", "N/A"),
+                "available": adv.get("surplusAmount", "N/A"),
+                "nickname": advertiser.get("nickName", "N/A"),
+                "min": adv.get("minSingleTransAmount", "N/A"),
+                "max": adv.get("maxSingleTransAmount", "N/A"),
+                "link": ADVERTISER_URL_PREFIX + str(user_no) if user_no else ADVERTISER_FALLBACK_URL,
+            }))
+        message = "".join(parts)
+
+    enqueue_message(
+        chat_id,
+        message,
+        dedupe=dedupe,
+        parse_mode=ParseMode.HTML,
+        disable_web_page_preview=True
+    )
+
+
+def format_and_send_top_prices(sellers, chat_id, count=10):
     """
-    Formats and sends top prices from sellers data.
+    Formats top prices from sellers data and queues them for the specified chat.
+    `sellers` is a list of (price, ad) pairs with the price already parsed to float.
     """
     logging.info(f"Preparing top {count} prices message for chat {chat_id}")
     if not sellers:
         message = "⚠️ No seller data available currently."
     else:
-        # Sort sellers by price (highest first)
-        sorted_sellers = sorted(sellers, key=lambda x: float(x.get("adv", {}).get("price", 0)), reverse=True)
-        top_sellers = sorted_sellers[:count]
+        # Pick the highest prices without sorting the whole list
+        top_sellers = heapq.nlargest(count, sellers, key=itemgetter(0))
         
-        message = f"<b>📈 Top {len(top_sellers)} Highest Prices:</b>\n\n"
-        for idx, ad in enumerate(top_sellers, 1):
-            adv = ad.get("adv", {})
-            price = adv.get("price", "N/A")
-            available = adv.get("surplusAmount", "N/A")
-            
-            advertiser = ad.get("advertiser", {})
-            nickname = advertiser.get("nickName", "N/A")
+        parts = [f"<b>📈 Top {len(top_sellers)} Highest Prices:</b>\n\n"]
+        for idx, (_, ad) in enumerate(top_sellers, 1):
+            adv, advertiser = _split_ad(ad)
             user_no = advertiser.get("userNo")
-            link = f"https://p2p.binance.com/en/advertiserDetail?advertiserNo={user_no}" if user_no else "https://p2p.binance.com/en"
 
-            message += (
-                f"{idx}. <b>{price} INR</b> | {available} USDT | {nickname}\n"
-                f"<a href=\"{link}\">🔗 View Profile</a>\n\n"
-            )
+            parts.append(_TOP_PRICE_ROW_TMPL.format_map({
+                "idx": idx,
+                "price": adv.get("price", "N/A"),
+                "available": adv.get("surplusAmount", "N/A"),
+                "nickname": advertiser.get("nickName", "N/A"),
+                "link": ADVERTISER_URL_PREFIX + str(user_no) if user_no else ADVERTISER_FALLBACK_URL,
+            }))
+        message = "".join(parts)
 
-    try:
-        await bot_instance.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode=ParseMode.HTML,
-            disable_web_page_preview=True
-        )
-        logging.info(f"Top prices message sent to chat {chat_id} successfully.")
-    except Exception as e:
-        logging.error(f"Error sending top prices message to chat {chat_id}: {e}")
+    enqueue_message(
+        chat_id,
+        message,
+        parse_mode=ParseMode.HTML,
+        disable_web_page_preview=True
+    )
 
 
-async def periodic_send_default(context: ContextTypes.DEFAULT_TYPE):
-    """Periodic task to send default threshold alerts."""
-    bot_instance = context.bot # Get bot instance from context
+async def poll_task(context: ContextTypes.DEFAULT_TYPE):
+    """
+    Fetches sellers once per tick and feeds both alerts from that single result:
+    the periodic summary every SUMMARY_INTERVAL seconds and the immediate threshold alert every tick.
+    """
+    # Count ticks rather than timing them, so fetch latency can't push the summary back a tick
+    tick = context.bot_data.get("poll_tick", 0)
+    context.bot_data["poll_tick"] = tick + 1
     try:
-        logging.info(f"Fetching sellers under default threshold {DEFAULT_THRESHOLD} for periodic alert.")
-        sellers = await get_top_sellers_under_threshold(DEFAULT_THRESHOLD)
-        await format_and_send_sellers(bot_instance, sellers, DEFAULT_THRESHOLD, TELEGRAM_CHAT_ID)
+        logging.info(f"Fetching sellers under default threshold {DEFAULT_THRESHOLD}.")
+        sellers = await get_top_sellers_under_threshold(DEFAULT_THRESHOLD, session=context.bot_data["session"])
     except Exception as e:
         logging.error(f"Error in periodic fetch: {e}")
+        return
 
-async def threshold_check_task(context: ContextTypes.DEFAULT_TYPE):
-    """Fast-checking task for immediate threshold alerts."""
-    bot_instance = context.bot # Get bot instance from context
-    try:
-        logging.info(f"Checking threshold alerts under {DEFAULT_THRESHOLD}.")
-        sellers = await get_top_sellers_under_threshold(DEFAULT_THRESHOLD)
-        if sellers:
-            logging.info("Threshold match found; sending immediate alert (first seller).")
-            await format_and_send_sellers(bot_instance, sellers[:1], DEFAULT_THRESHOLD, TELEGRAM_CHAT_ID)
-        else:
-            logging.info("No sellers found matching the threshold for immediate alert.")
-    except Exception as e:
-        logging.error(f"Error in threshold check: {e}")
+    if tick % (SUMMARY_INTERVAL // POLL_INTERVAL) == 0:
+        format_and_send_sellers(sellers, DEFAULT_THRESHOLD, TELEGRAM_CHAT_ID)
+
+    if sellers:
+        logging.info("Threshold match found; sending immediate alert (first seller).")
+        format_and_send_sellers(sellers[:1], DEFAULT_THRESHOLD, TELEGRAM_CHAT_ID, dedupe=True)
+    else:
+        logging.info("No sellers found matching the threshold for immediate alert.")
+        # Only consecutive repeats are skipped; a seller coming back later is alerted again
+        LAST_SENT.pop(TELEGRAM_CHAT_ID, None)
 
 
 async def top5_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -149,20 +298,20 @@ async def top5_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logging.info(f"Parsed threshold from command arguments: {threshold}")
         except ValueError:
             logging.warning(f"Invalid threshold argument received: '{args[0]}'. Using default threshold: {DEFAULT_THRESHOLD}")
-            await context.bot.send_message(chat_id=chat_id, text=f"⚠️ Invalid threshold provided: '{args[0]}'. Using default threshold of {DEFAULT_THRESHOLD} INR.")
+            await send_message(context.bot, chat_id=chat_id, text=f"⚠️ Invalid threshold provided: '{args[0]}'. Using default threshold of {DEFAULT_THRESHOLD} INR.")
     else:
         logging.info(f"No threshold argument provided. Using default threshold: {DEFAULT_THRESHOLD}")
 
-    await context.bot.send_message(chat_id=chat_id, text=f"🔄 Fetching top 5 sellers under {threshold} INR...")
+    await send_message(context.bot, chat_id=chat_id, text=f"🔄 Fetching top 5 sellers under {threshold} INR...")
     logging.info(f"Fetching top 5 sellers under threshold: {threshold} for chat {chat_id}")
 
     try:
-        sellers = await get_top_sellers_under_threshold(threshold)
-        await format_and_send_sellers(context.bot, sellers, threshold, chat_id) # Pass context.bot here
+        sellers = await get_top_sellers_under_threshold(threshold, session=context.bot_data["session"])
+        format_and_send_sellers(sellers, threshold, chat_id)
         logging.info(f"Successfully processed /top5 command for threshold {threshold}")
     except Exception as e:
         logging.error(f"Error in /top5 command for threshold {threshold}: {e}", exc_info=True)
-        await context.bot.send_message(chat_id=chat_id, text=f"⚠️ Error fetching sellers: {e}")
+        await send_message(context.bot, chat_id=chat_id, text=f"⚠️ Error fetching sellers: {e}")
 
 
 async def topprices_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -187,19 +336,19 @@ async def topprices_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logging.info(f"Parsed count from command arguments: {count}")
         except ValueError:
             logging.warning(f"Invalid count argument received: '{args[0]}'. Using default count: 10")
-            await context.bot.send_message(chat_id=chat_id, text=f"⚠️ Invalid count provided: '{args[0]}'. Using default count of 10.")
+            await send_message(context.bot, chat_id=chat_id, text=f"⚠️ Invalid count provided: '{args[0]}'. Using default count of 10.")
 
-    await context.bot.send_message(chat_id=chat_id, text=f"🔄 Fetching top {count} highest prices...")
+    await send_message(context.bot, chat_id=chat_id, text=f"🔄 Fetching top {count} highest prices...")
     logging.info(f"Fetching top {count} prices for chat {chat_id}")
 
     try:
-        # Get all sellers (using a high threshold to get most sellers)
-        sellers = await get_top_sellers_under_threshold(999999)  # High threshold to get all
-        await format_and_send_top_prices(context.bot, sellers, chat_id, count)
+        ads = await fetch_all_ads(context.bot_data["session"])
+        sellers = parse_ads(ads)
+        format_and_send_top_prices(sellers, chat_id, count)
         logging.info(f"Successfully processed /topprices command for count {count}")
     except Exception as e:
         logging.error(f"Error in /topprices command for count {count}: {e}", exc_info=True)
-        await context.bot.send_message(chat_id=chat_id, text=f"⚠️ Error fetching top prices: {e}")
+        await send_message(context.bot, chat_id=chat_id, text=f"⚠️ Error fetching top prices: {e}")
 
 
 async def post_init(application: Application):
@@ -208,6 +357,8 @@ async def post_init(application: Application):
     and an event loop is running. This is the ideal place to schedule background tasks.
     """
     logging.info("Application post-initialization: scheduling periodic tasks.")
+    # One shared HTTP session for all Binance fetches, so connections are reused between polls.
+    application.bot_data["session"] = create_session()
     # Send startup message. application.bot is now available.
     try:
         startup_message = """✅ <b>Binance P2P Alert Bot Started Successfully!</b>
@@ -228,39 +379,75 @@ async def post_init(application: Application):
 
 💡 <b>Tip:</b> Bot will automatically notify you of good deals!"""
 
-        await application.bot.send_message(
+        await send_message(
+            application.bot,
             chat_id=TELEGRAM_CHAT_ID, 
             text=startup_message,
             parse_mode=ParseMode.HTML
         )
         logging.info(f"Startup message with commands sent to chat {TELEGRAM_CHAT_ID}.")
     except Exception as e:
-        logging.error(f"Error sending startup message to {TELEGRAM_CHAT_ID}: {e}")
+        logging.error(f"Error sending startup message to {TELEGRAM_CHAT_ID}: {e!r}")
+
+    # A plain task rather than application.create_task: the application isn't running yet here,
+    # so PTB wouldn't track it anyway, and once tracked, stop() would wait on this endless loop.
+    # post_stop drains and cancels it instead.
+    application.bot_data["sender_task"] = asyncio.create_task(sender_worker(application.bot))
 
     # Use application.job_queue for robust scheduling.
     # It integrates directly with the application's event loop.
     # Jobs can be configured to run periodically.
-    application.job_queue.run_repeating(periodic_send_default, interval=300, first=0) # runs every 5 minutes
-    application.job_queue.run_repeating(threshold_check_task, interval=60, first=0) # runs every 1 minute
+    # A single job fetches once per minute; it sends the 5-minute summary itself.
+    application.job_queue.run_repeating(poll_task, interval=POLL_INTERVAL, first=0)
     logging.info("Periodic tasks scheduled using JobQueue.")
 
-async def post_shutdown(application: Application):
+async def post_stop(application: Application):
     """
-    This function is called by python-telegram-bot *before* the application shuts down.
+    This function is called by python-telegram-bot after the application has stopped,
+    but while the bot can still send messages.
     """
-    logging.info("Application post-shutdown: stopping periodic tasks.")
+    logging.info("Application post-stop: flushing outbound messages.")
     # JobQueue automatically stops its jobs when the application stops.
+    sender_task = application.bot_data.pop("sender_task", None)
+    if sender_task is not None:
+        try:
+            await asyncio.wait_for(OUT_QUEUE.join(), timeout=DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning(f"Dropping {OUT_QUEUE.qsize()} unsent queued messages on shutdown.")
+        sender_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sender_task
+        logging.info("Outbound message worker stopped.")
+
     try:
-        await application.bot.send_message(chat_id=TELEGRAM_CHAT_ID, text="🔴 Binance P2P Alert Bot Stopped.")
+        await send_message(application.bot, chat_id=TELEGRAM_CHAT_ID, text="🔴 Binance P2P Alert Bot Stopped.")
     except Exception as e:
-        logging.warning(f"Could not send shutdown message: {e}")
+        logging.warning(f"Could not send shutdown message: {e!r}")
+
+async def post_shutdown(application: Application):
+    """
+    This function is called by python-telegram-bot *after* the application has shut down;
+    the bot can no longer send messages here.
+    """
+    logging.info("Application post-shutdown: closing HTTP session.")
+    session = application.bot_data.pop("session", None)
+    if session is not None:
+        await session.close()
+        logging.info("HTTP session closed.")
 
 
 def main():
     logging.info("🚀 Starting Binance P2P Alert Bot Setup...")
+    logging.info(f"Using {JSON_BACKEND} for Binance and Telegram JSON encoding/decoding.")
 
     # Use ApplicationBuilder for a cleaner setup
-    application = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    # Same pool size ApplicationBuilder uses for its default request object
+    application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .request(JSONBodyHTTPXRequest(connection_pool_size=256))
+        .build()
+    )
     logging.info("Telegram Application built.")
 
     # Add handlers
@@ -268,9 +455,10 @@ def main():
     application.add_handler(CommandHandler("topprices", topprices_command))
     logging.info("Command handlers added: /top5, /topprices")
 
-    # Set up post-initialization and post-shutdown callbacks
+    # Set up post-initialization, post-stop and post-shutdown callbacks
     # These run within the application's managed event loop.
     application.post_init = post_init  # FIXED: Assignment, not function call
+    application.post_stop = post_stop
     application.post_shutdown = post_shutdown  # FIXED: Assignment, not function call
 
     logging.info("🤖 Bot polling started.")
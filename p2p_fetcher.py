@@ -1,38 +1,115 @@
+import asyncio
+import time
+
 import aiohttp
 
+# Fastest available JSON backend: orjson, then yapic.json, then ujson, then the stdlib.
+# json_dumps returns str (what aiohttp's json_serialize needs); json_dumps_bytes returns
+# bytes for transports that take a raw body, so orjson output skips the str round trip.
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps_bytes = orjson.dumps
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        from yapic.json import loads as json_loads, dumps as json_dumps
+        JSON_BACKEND = "yapic.json"
+    except ImportError:
+        try:
+            from ujson import loads as json_loads, dumps as json_dumps
+            JSON_BACKEND = "ujson"
+        except ImportError:
+            from json import loads as json_loads, dumps as json_dumps
+            JSON_BACKEND = "json"
+
+    def json_dumps_bytes(obj):
+        return json_dumps(obj).encode()
+
 BINANCE_P2P_URL = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
 PAIRS = ["USDT", "INR"]
 PAYMENT_METHODS = []
+TRADE_TYPE = "SELL"
+CACHE_TTL = 2.0  # seconds a fetched ad list is reused by concurrent callers
+FETCH_TIMEOUT = 10  # seconds before a Binance request is abandoned
+
+# (rows, tradeType) -> (monotonic timestamp, ads)
+_cache = {}
+# (rows, tradeType) -> task of the request currently in flight for that key
+_inflight = {}
+
+def create_session():
+    """Create the long-lived session shared by every fetch so connections are kept alive."""
+    # Keep the idle connection open past the 60s poll interval so each tick reuses it.
+    connector = aiohttp.TCPConnector(
+        limit=10, ttl_dns_cache=300, keepalive_timeout=120, force_close=False
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT),
+        json_serialize=json_dumps,
+    )
 
 async def fetch_binance_p2p(session, rows=20):
+    key = (rows, TRADE_TYPE)
+    cached = _cache.get(key)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL:
+        return cached[1]
+
+    # Callers arriving while a request is in flight wait on that same request.
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache(session, rows, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+async def _fetch_and_cache(session, rows, key):
+    ads = await _fetch_binance_p2p(session, rows)
+    _cache[key] = (time.monotonic(), ads)
+    return ads
+
+async def _fetch_binance_p2p(session, rows):
     payload = {
         "asset": PAIRS[0],
         "fiat": PAIRS[1],
         "merchantCheck": False,
         "page": 1,
         "rows": rows,
-        "tradeType": "SELL",
+        "tradeType": TRADE_TYPE,
         "payTypes": PAYMENT_METHODS
     }
     headers = {"Content-Type": "application/json"}
     async with session.post(BINANCE_P2P_URL, json=payload, headers=headers) as resp:
-        data = await resp.json()
+        # Decode the raw bytes directly; orjson parses UTF-8 without an extra decode step
+        data = json_loads(await resp.read())
         return data.get("data", [])
 
-async def get_top_sellers_under_threshold(threshold, rows=20, limit=5):
-    async with aiohttp.ClientSession() as session:
-        ads = await fetch_binance_p2p(session, rows=rows)
-        filtered_ads = []
-        for ad in ads:
-            adv = ad.get("adv", {})
-            price_str = adv.get("price")
-            if price_str:
-                try:
-                    price = float(price_str)
-                    if price <= threshold:
-                        filtered_ads.append(ad)
-                except ValueError:
-                    continue
-            if len(filtered_ads) == limit:
-                break
-        return filtered_ads
+def _parse_price(ad):
+    try:
+        return float(ad["adv"]["price"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def parse_ads(ads):
+    """Return (price, ad) pairs, parsing each ad's price string exactly once."""
+    parsed = []
+    for ad in ads:
+        price = _parse_price(ad)
+        if price is not None:
+            parsed.append((price, ad))
+    return parsed
+
+async def fetch_all_ads(session, rows=20):
+    """Returns every fetched ad, without any threshold filtering."""
+    return await fetch_binance_p2p(session, rows=rows)
+
+async def get_top_sellers_under_threshold(threshold, rows=20, limit=5, *, session):
+    """Returns up to `limit` ads priced at or under `threshold`."""
+    ads = await fetch_binance_p2p(session, rows=rows)
+    return [ad for price, ad in parse_ads(ads) if price <= threshold][:limit]